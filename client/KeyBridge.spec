@@ -10,9 +10,14 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Stdlib and framework bindings the app never imports
+    excludes=[
+        'tkinter', 'test', 'unittest', 'rumps',
+        'pydoc', 'pydoc_data', 'distutils', 'lib2to3',
+        'WebKit', 'CoreData',
+    ],
     noarchive=False,
-    optimize=0,
+    optimize=2,  # Byte-compile with -OO (no docstrings/asserts)
 )
 pyz = PYZ(a.pure)
 
@@ -49,6 +54,6 @@ app = BUNDLE(
     bundle_identifier=None,
     info_plist={
         'NSBluetoothAlwaysUsageDescription': 'KeyBridge needs Bluetooth to send keystrokes to the USB dongle.',
-        'NSInputMonitoringUsageDescription': 'KeyBridge needs keyboard monitoring for the Ctrl+Shift+V hotkey.',
+        'NSInputMonitoringUsageDescription': 'KeyBridge needs keyboard monitoring for the Ctrl+Cmd+V hotkey.',
     },
 )
@@ -0,0 +1,455 @@
+"""
+BLE sending core for the KeyBridge menu bar app.
+
+Owns the asyncio loop thread and everything about the link to the dongle:
+device cache, warm-connection reuse, flow-controlled chunked writes and the
+idle disconnect. UI feedback goes out through the callbacks given to
+BleSender. measure_ack_every() is shared with hid_bridge.py so both clients
+pipeline writes the same way for a given link.
+"""
+
+import asyncio
+import math
+import os
+import statistics
+import threading
+import time
+
+# BLE UUIDs (must match firmware)
+SERVICE_UUID = "4fafc201-1fb5-459e-8fcc-c5c9c331914b"
+CHAR_TEXT_UUID = "beb5483e-36e1-4688-b7f5-ea07361b26a8"
+CHAR_STATUS_UUID = "beb5483e-36e1-4688-b7f5-ea07361b26aa"
+
+DEVICE_NAME = "KeyBridge"
+
+IDLE_DISCONNECT = 30.0  # Seconds to keep the BLE connection open after a send
+# Acknowledge every Nth chunk when writing without response, if the link's
+# round trip can't be measured; the firmware's 64KB buffer and the status
+# notifications bound how far a window this small can run ahead
+ACK_EVERY = 8
+PREWARM_INTERVAL = 300.0  # Seconds between background scans while disconnected
+
+# Air time of one write on the 1M PHY, used to size the acknowledgement window
+LL_BYTE_TIME = 8e-6  # Seconds per byte
+LL_WRITE_OVERHEAD = 17  # Preamble, access address, LL/L2CAP/ATT headers, CRC
+MAX_ACK_EVERY = 64
+
+DEBUG = bool(os.environ.get("KEYBRIDGE_DEBUG"))  # Per-send trace output
+RELIABLE = bool(os.environ.get("KEYBRIDGE_RELIABLE"))  # Acknowledge every chunk
+
+
+async def measure_ack_every(client, chunk_size, samples=5):
+    """Size the acknowledgement window from the round trip of a few status reads.
+
+    Enough chunks are left unacknowledged to keep the link busy for one round
+    trip. Returns (ack_every, rtt), or None if a read fails.
+    """
+    rtts = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(client.read_gatt_char(CHAR_STATUS_UUID), timeout=1.0)
+        except Exception:
+            return None
+        rtts.append(time.perf_counter() - t0)
+
+    rtt = statistics.median(rtts)
+    air_time = (chunk_size + LL_WRITE_OVERHEAD) * LL_BYTE_TIME
+    return max(1, min(MAX_ACK_EVERY, math.ceil(rtt / air_time))), rtt
+
+
+class BleSender:
+    """Sends encoded text to the dongle from a background asyncio thread.
+
+    on_status(state) is called with "connecting", "sending" or "waiting";
+    on_notify(title, subtitle, message) reports results and errors;
+    on_done() fires when a send finishes either way. All three run on the
+    BLE thread.
+
+    ack_every fixes the acknowledgement window instead of measuring it on
+    each new connection; reliable acknowledges every chunk.
+    """
+
+    def __init__(self, on_status, on_notify, on_done, ack_every=None, reliable=False):
+        self._on_status = on_status
+        self._notify = on_notify
+        self._on_done = on_done
+        self._fixed_ack_every = max(1, ack_every) if ack_every else None
+        self.reliable = reliable
+
+        self.loop = None
+        self.thread = None
+        self._BleakClient = None  # bleak classes, imported on the BLE thread
+        self._BleakScanner = None
+        self.busy = False
+        self.cached_device = None
+        self.client = None
+        self._chunk_size = None
+        self._text_char = None
+        self._write_without_response = False
+        self._ack_every = self._fixed_ack_every or ACK_EVERY
+        self._idle_handle = None
+        self._idle_task = None  # Held so the loop's weak reference can't drop it
+        self._prewarm_task = None  # Background scan in flight, if any
+        self._prewarm_handle = None  # Timer for the next background scan
+        self._last_used = 0.0  # time.monotonic() of the last write
+
+    def start(self):
+        """Start the asyncio event loop in a background thread."""
+
+        def run_loop():
+            try:
+                import uvloop  # Optional: faster event loop for the BLE thread
+            except ImportError:
+                uvloop = None
+
+            # Publish the loop first: sends made while bleak is still importing
+            # queue on it and run once run_forever() starts
+            loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self.loop = loop
+
+            # bleak pulls in the CoreBluetooth bindings; importing it here keeps
+            # that cost off the launch path, before the status item appears
+            from bleak import BleakClient, BleakScanner
+
+            self._BleakClient, self._BleakScanner = BleakClient, BleakScanner
+            # Find the dongle before the first hotkey press needs it
+            self._start_prewarm()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run_loop, daemon=True)
+        self.thread.start()
+
+    def send_async(self, encoded):
+        """Queue a send from any thread; returns False if the loop isn't up yet."""
+        if not self.loop:
+            return False
+        self.busy = True
+        asyncio.run_coroutine_threadsafe(self.send(encoded), self.loop)
+        return True
+
+    def stop(self, timeout=2.0):
+        """Close the warm connection, then stop the loop."""
+        if not self.loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def _shutdown(self):
+        """Stop background scanning and close the warm connection."""
+        if self._prewarm_handle:
+            self._prewarm_handle.cancel()
+            self._prewarm_handle = None
+        if self._prewarm_task and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
+        await self._disconnect()
+
+    async def send(self, encoded):
+        """Complete flow: connect (or reuse) → send → wait for completion."""
+        self.busy = True
+        client = None
+        succeeded = False
+
+        # A send is in progress — don't let the idle timer drop the connection
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+        try:
+            client = await self._ensure_connected()
+            if client is None:
+                self._notify("KeyBridge", "Not Found", f"Cannot find '{DEVICE_NAME}'")
+                return
+
+            # Send text
+            self._on_status("sending")
+            await self._send_bytes(client, encoded)
+
+            # Wait for firmware to finish typing (queue fully drained)
+            self._on_status("waiting")
+            await self._wait_for_completion(client)
+
+            self._notify("KeyBridge", "Sent", f"{len(encoded)} chars")
+            succeeded = True
+
+        except Exception as e:
+            self._notify("KeyBridge", "Error", str(e)[:50])
+
+        finally:
+            if succeeded:
+                # Keep the connection warm; drop it after a quiet period
+                self._last_used = time.monotonic()
+                self._idle_handle = asyncio.get_running_loop().call_later(
+                    IDLE_DISCONNECT, self._idle_disconnect
+                )
+            else:
+                # Start the next send from a clean connection
+                if client and client is not self.client and client.is_connected:
+                    try:
+                        await client.disconnect()
+                    except Exception:
+                        pass
+                await self._disconnect()
+            self.busy = False
+            self._on_done()
+
+    async def _ensure_connected(self):
+        """Return a connected client: the warm one, the cached device, or a fresh scan."""
+        # Reuse the warm connection from the previous send
+        if (
+            self.client is not None
+            and self.client.is_connected
+            and time.monotonic() - self._last_used < IDLE_DISCONNECT
+        ):
+            return self.client
+        await self._disconnect()
+
+        # Let a background scan that is already running finish rather than
+        # starting a second one next to it
+        if self._prewarm_task and not self._prewarm_task.done():
+            try:
+                await asyncio.shield(self._prewarm_task)
+            except Exception:
+                pass
+
+        client = None
+        # Try the device found by the previous send before paying for a scan
+        if self.cached_device is not None:
+            self._on_status("connecting")
+            # A BLEDevice (never an address string) lets bleak connect without rescanning
+            client = self._BleakClient(
+                self.cached_device, disconnected_callback=self._on_disconnect
+            )
+            try:
+                await asyncio.wait_for(client.connect(), timeout=3.0)
+            except Exception:
+                # A connect cut off by the timeout can leave a half-open link;
+                # the dongle won't advertise for the scan below until it's gone
+                try:
+                    await client.disconnect()
+                except Exception:
+                    pass
+                client = None
+                self.cached_device = None
+
+        if client is None:
+            # Find device (with retry in case dongle is mid-restart)
+            device = await self._BleakScanner.find_device_by_name(DEVICE_NAME, timeout=10.0)
+            if device is None:
+                await asyncio.sleep(2)
+                device = await self._BleakScanner.find_device_by_name(
+                    DEVICE_NAME, timeout=10.0
+                )
+            if device is None:
+                return None
+
+            # Connect with a fresh client each session (no stale state)
+            self._on_status("connecting")
+            client = self._BleakClient(device, disconnected_callback=self._on_disconnect)
+            await asyncio.wait_for(client.connect(), timeout=10.0)
+            self.cached_device = device
+
+        # New connection: cache it and its chunk size (MTU - 3 for ATT header)
+        self.client = client
+        self._chunk_size = client.mtu_size - 3
+        # Resolve the characteristic once; writes pass the object, not the UUID
+        text_char = client.services.get_characteristic(CHAR_TEXT_UUID)
+        self._text_char = text_char or CHAR_TEXT_UUID
+        self._write_without_response = (
+            text_char is not None and "write-without-response" in text_char.properties
+        )
+        # Only writes without response are pipelined, so only they need a window
+        if self._write_without_response and not self.reliable and not self._fixed_ack_every:
+            measured = await measure_ack_every(client, self._chunk_size)
+            self._ack_every = measured[0] if measured else ACK_EVERY
+            if DEBUG and measured:
+                print(f"[BLE] Round trip {measured[1] * 1000:.1f} ms, ack every {measured[0]}")
+        return client
+
+    async def _send_bytes(self, client, encoded):
+        """Write encoded text in chunks, pausing while the firmware buffer is full."""
+        chunk_size = self._chunk_size
+        text_char = self._text_char
+        ack_every = self._ack_every
+        view = memoryview(encoded)  # zero-copy chunk slices
+
+        # Flow control: track firmware buffer free space via notifications
+        FIRMWARE_BUFFER = 65535  # Exact usable buffer (64KB - 1 circular sentinel)
+        SEND_THRESHOLD = 4096  # Pause sending if fewer than 4KB free
+
+        buffer_event = asyncio.Event()
+        buffer_event.set()
+        current_free = [FIRMWARE_BUFFER]
+
+        # Read actual buffer status from firmware (set on connect)
+        try:
+            raw = await asyncio.wait_for(
+                client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0
+            )
+            val = int.from_bytes(raw, "little")
+            if val > 0:
+                current_free[0] = val
+        except Exception:
+            pass  # Fall back to FIRMWARE_BUFFER default
+
+        def status_callback(sender, data):
+            try:
+                if data and len(data) >= 4:
+                    current_free[0] = int.from_bytes(data[:4], "little")
+            except Exception:
+                pass
+            buffer_event.set()  # Always signal to prevent flow control hang
+
+        await client.start_notify(CHAR_STATUS_UUID, status_callback)
+        try:
+            for n, i in enumerate(range(0, len(encoded), chunk_size)):
+                chunk = view[i : i + chunk_size]
+
+                # Wait if not enough free space (with timeout to prevent infinite hangs)
+                wait_start = time.monotonic()
+                while current_free[0] < SEND_THRESHOLD:
+                    # Wait for buffer space notification with timeout
+                    buffer_event.clear()
+                    try:
+                        await asyncio.wait_for(buffer_event.wait(), timeout=5.0)
+                    except asyncio.TimeoutError:
+                        # Re-check buffer status on timeout
+                        try:
+                            raw = await asyncio.wait_for(
+                                client.read_gatt_char(CHAR_STATUS_UUID), timeout=2.0
+                            )
+                            current_free[0] = int.from_bytes(raw, "little")
+                        except Exception:
+                            pass  # Keep current estimate and continue waiting
+
+                        # Check if we've waited too long (30 seconds max)
+                        if time.monotonic() - wait_start > 30:
+                            print(
+                                f"[FLOW] Buffer wait timed out after 30s, forcing through"
+                            )
+                            break
+
+                # Writes without response go out back-to-back through the controller
+                # queue; every ack_every-th chunk and the last one are acknowledged
+                # so the OS queue can't run ahead of the link.
+                response = (
+                    not self._write_without_response
+                    or self.reliable
+                    or n % ack_every == ack_every - 1
+                    or i + chunk_size >= len(encoded)
+                )
+
+                # Send with timeout — prevents infinite hang if firmware stops responding
+                await asyncio.wait_for(
+                    client.write_gatt_char(text_char, chunk, response=response),
+                    timeout=10.0,
+                )
+
+                # Deduct only after the write went out; status notifications
+                # overwrite this estimate with the firmware's real free space.
+                current_free[0] = max(0, current_free[0] - len(chunk))
+                self._last_used = time.monotonic()
+        finally:
+            try:
+                await client.stop_notify(CHAR_STATUS_UUID)
+            except Exception:
+                pass  # Swallow — outer finally handles disconnect
+
+    def _start_prewarm(self):
+        """Start a background scan, keeping the task so it can't be collected."""
+        self._prewarm_handle = None
+        self._prewarm_task = self.loop.create_task(self._prewarm_scan())
+
+    async def _prewarm_scan(self):
+        """Cache the dongle's BLEDevice in the background, then re-arm."""
+        if not self.busy and self.client is None:
+            try:
+                device = await self._BleakScanner.find_device_by_name(DEVICE_NAME, timeout=5.0)
+                if device is not None:
+                    self.cached_device = device
+            except Exception as e:
+                if DEBUG:
+                    print(f"[SCAN] Background scan failed: {e}")
+
+        self._prewarm_handle = self.loop.call_later(PREWARM_INTERVAL, self._start_prewarm)
+
+    def _on_disconnect(self, client):
+        """Forget a warm connection the dongle dropped on its own."""
+        if client is self.client:
+            if DEBUG:
+                print("[BLE] Dongle disconnected")
+            self.client = None
+            self._text_char = None
+
+    def _idle_disconnect(self):
+        """Drop the warm connection after IDLE_DISCONNECT seconds without a send."""
+        self._idle_handle = None
+        if not self.busy:
+            self._idle_task = asyncio.ensure_future(self._disconnect())
+
+    async def _disconnect(self):
+        """Disconnect and forget the cached BLE client and its characteristic."""
+        client, self.client = self.client, None
+        self._text_char = None
+        if client and client.is_connected:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+
+    async def _wait_for_completion(self, client):
+        """Wait until firmware reports buffer is fully free (typing complete)."""
+        FIRMWARE_BUFFER_FULL = 65535
+        COMPLETION_TIMEOUT = 180  # 3 minutes max for very large pastes
+        POLL_INTERVAL = 1.0
+
+        start = time.monotonic()
+        last_free = 0
+        stall_count = 0
+
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= COMPLETION_TIMEOUT:
+                print(
+                    f"[COMPLETE] Timed out after {elapsed:.1f}s — firmware may still be typing"
+                )
+                return
+
+            try:
+                raw = await asyncio.wait_for(
+                    client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0
+                )
+                current_free = int.from_bytes(raw, "little")
+            except Exception:
+                stall_count += 1
+                if stall_count >= 10:
+                    print(
+                        f"[COMPLETE] Stalled reading status for {stall_count} attempts"
+                    )
+                    return
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+
+            stall_count = 0  # Reset on successful read
+
+            if current_free >= FIRMWARE_BUFFER_FULL - 1:
+                if DEBUG:
+                    print(f"[COMPLETE] Firmware queue drained after {elapsed:.1f}s")
+                return
+
+            # Detect stall (buffer not freeing for 30+ seconds)
+            if current_free == last_free:
+                stall_count += 1
+                if stall_count >= 30:
+                    print(f"[COMPLETE] Buffer stalled at {current_free} free for 30s")
+                    return
+            else:
+                stall_count = 0
+
+            last_free = current_free
+            await asyncio.sleep(POLL_INTERVAL)
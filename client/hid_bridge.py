@@ -8,16 +8,21 @@ on the target computer via USB HID.
 
 import argparse
 import asyncio
+import binascii
+import collections
+import io
 import sys
 import signal
 import subprocess
 import os
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
 from bleak import BleakClient, BleakScanner
 from bleak.backends.device import BLEDevice
 
+from ble_core import measure_ack_every
+
 # Box-drawing characters to ASCII
 _BOX_CHARS = {
     '┌': '+', '┐': '+', '└': '+', '┘': '+',
@@ -31,6 +36,9 @@ _BOX_CHARS = {
 
 def convert_to_ascii(text: str) -> str:
     """Convert all non-ASCII characters to ASCII equivalents."""
+    if text.isascii():
+        # Common case: nothing to convert, checked in C
+        return text
     result = []
     for c in text:
         if ord(c) <= 127:
@@ -47,6 +55,16 @@ def convert_to_ascii(text: str) -> str:
 
 def get_clipboard():
     """Get clipboard content on macOS, preserving all formatting."""
+    try:
+        # Imported here so modes that never read the clipboard don't pay for AppKit
+        from AppKit import NSPasteboard, NSPasteboardTypeString  # Optional: macOS only
+    except ImportError:
+        pass
+    else:
+        # In-process read; no pbpaste fork and no re-decode
+        text = NSPasteboard.generalPasteboard().stringForType_(NSPasteboardTypeString)
+        return str(text) if text else None
+
     try:
         # Use text=False to get raw bytes, then decode to preserve all chars
         result = subprocess.run(['pbpaste'], capture_output=True, text=False, timeout=2)
@@ -57,43 +75,36 @@ def get_clipboard():
         return None
 
 
-def is_binary_file(file_path: str, sample_size: int = 8192) -> bool:
-    """Check if a file is binary by looking for null bytes."""
-    try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(sample_size)
-            if b'\x00' in chunk:
-                return True
-            # Check for high ratio of non-text bytes
-            text_chars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)))
-            non_text = sum(1 for b in chunk if b not in text_chars)
-            return non_text / len(chunk) > 0.30 if chunk else False
-    except (OSError, IOError) as e:
-        print(f"Warning: Could not check if file is binary: {e}")
-        return True
-
+# Bytes that may appear in text files; everything else counts as binary
+_TEXT_CHARS = bytes(sorted({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100))))
 
-def read_text_file(file_path: str) -> Optional[str]:
-    """Read a text file and return its contents."""
-    if not os.path.exists(file_path):
-        print(f"Error: File not found: {file_path}")
-        return None
 
-    if not os.path.isfile(file_path):
-        print(f"Error: Not a file: {file_path}")
-        return None
+def looks_binary(sample: bytes) -> bool:
+    """Check if file data is binary by looking for null bytes."""
+    if b'\x00' in sample:
+        return True
+    # Check for high ratio of non-text bytes (deleting text bytes leaves the rest)
+    non_text = len(sample.translate(None, _TEXT_CHARS))
+    return non_text / len(sample) > 0.30 if sample else False
 
-    if is_binary_file(file_path):
-        print(f"Error: File appears to be binary: {file_path}")
-        return None
 
+def load_file(file_path: str, sample_size: int = 8192) -> Optional[Tuple[bytes, bool]]:
+    """Read a file once and return its contents and whether it looks binary."""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            return f.read()
-    except (OSError, IOError, UnicodeDecodeError) as e:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except (OSError, IOError) as e:
         print(f"Error reading file: {e}")
         return None
 
+    return data, looks_binary(data[:sample_size])
+
+
+def decode_text(data: bytes) -> str:
+    """Decode file contents as UTF-8 text with universal newlines."""
+    text = data.decode('utf-8', errors='replace')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
 # BLE UUIDs (must match firmware)
 SERVICE_UUID = "4fafc201-1fb5-459e-8fcc-c5c9c331914b"
 CHAR_TEXT_UUID = "beb5483e-36e1-4688-b7f5-ea07361b26a8"
@@ -102,6 +113,15 @@ CHAR_STATUS_UUID = "beb5483e-36e1-4688-b7f5-ea07361b26aa"
 
 DEVICE_NAME = "KeyBridge"
 
+# Firmware requests the BLE 5.0 maximum ATT MTU; one write carries MTU - 3 bytes
+MAX_MTU = 517
+
+# BlueZ debugfs knobs for the connection interval (units of 1.25 ms), per
+# adapter; the adapter is the one bleak found the dongle on
+BLUEZ_DEBUGFS = "/sys/kernel/debug/bluetooth"
+CONN_MIN_INTERVAL = 6   # 7.5 ms
+CONN_MAX_INTERVAL = 9   # 11.25 ms
+
 # HID Modifier bits
 MOD_LCTRL = 0x01
 MOD_LSHIFT = 0x02
@@ -154,17 +174,104 @@ SHIFT_CHARS = {
     'Y': 'y', 'Z': 'z',
 }
 
+# Byte-indexed lookup tables built from the maps above: keycode and modifier
+# for every single-byte character (0 = no key)
+ASCII_TO_HID = bytearray(256)
+ASCII_TO_MOD = bytearray(256)
+for _ch, _kc in MAC_KEY_TO_HID.items():
+    if len(_ch) == 1 and ord(_ch) < 256:
+        ASCII_TO_HID[ord(_ch)] = _kc
+for _sh, _base in SHIFT_CHARS.items():
+    ASCII_TO_HID[ord(_sh)] = MAC_KEY_TO_HID.get(_base.lower(), 0)
+    ASCII_TO_MOD[ord(_sh)] = MOD_LSHIFT
+ASCII_TO_HID[ord('\n')] = 0x28  # Newline types Enter
+# Both folded together so the key listener does a single lookup per character
+ASCII_TO_MOD_KC = tuple((ASCII_TO_MOD[b], ASCII_TO_HID[b]) for b in range(256))
+
+
+def bluez_adapter(device) -> Optional[str]:
+    """Name of the BlueZ adapter (e.g. "hci1") a scanned device was seen on."""
+    details = getattr(device, 'details', None)
+    path = details.get('path') if isinstance(details, dict) else None
+    if not path:
+        return None
+    # D-Bus object path: /org/bluez/<adapter>/dev_XX_XX_XX_XX_XX_XX
+    parts = path.split('/')
+    return parts[3] if len(parts) > 3 and parts[1:3] == ['org', 'bluez'] else None
+
+
+def request_low_latency_interval(adapter: Optional[str]) -> Optional[dict]:
+    """
+    Ask BlueZ for a short connection interval on new connections.
+
+    The setting is adapter-wide and persists until reboot, so the previous
+    values are returned for restore_interval() once the connection exists.
+    Only possible on Linux as root; returns None otherwise. On macOS the
+    interval is whatever the peripheral requests (see firmware onConnect).
+    """
+    if not sys.platform.startswith('linux') or not adapter:
+        return None
+    debugfs = os.path.join(BLUEZ_DEBUGFS, adapter)
+    saved = {'debugfs': debugfs}
+    try:
+        for name in ('conn_min_interval', 'conn_max_interval'):
+            with open(os.path.join(debugfs, name)) as f:
+                saved[name] = f.read().strip()
+        # Min first: the new min stays below the old max, the new max above the new min
+        for name, value in (('conn_min_interval', CONN_MIN_INTERVAL),
+                            ('conn_max_interval', CONN_MAX_INTERVAL)):
+            with open(os.path.join(debugfs, name), 'w') as f:
+                f.write(str(value))
+    except OSError:
+        restore_interval(saved)
+        return None
+    print(f"Connection interval set to {CONN_MIN_INTERVAL}-{CONN_MAX_INTERVAL} "
+          f"(was {saved['conn_min_interval']}-{saved['conn_max_interval']}) on {adapter}")
+    return saved
+
+
+def restore_interval(saved: Optional[dict]):
+    """Put back the BlueZ interval defaults saved by request_low_latency_interval()."""
+    if not saved:
+        return
+    # Max first, mirroring the order used to lower them
+    for name in ('conn_max_interval', 'conn_min_interval'):
+        if name in saved:
+            try:
+                with open(os.path.join(saved['debugfs'], name), 'w') as f:
+                    f.write(saved[name])
+            except OSError as e:
+                print(f"Warning: could not restore {name}: {e}")
+
+
+def base64_length(data: bytes) -> int:
+    """Length of data once base64-encoded (without newlines)."""
+    return 4 * -(-len(data) // 3)
+
 
 class KeyBridgeClient:
     """BLE client for the KeyBridge dongle."""
 
-    def __init__(self):
+    def __init__(self, ack_every: Optional[int] = None, reliable: bool = False, no_delay: bool = False):
         self.client: Optional[BleakClient] = None
         self.device: Optional[BLEDevice] = None
         self.running = False
-        self.key_queue: asyncio.Queue = asyncio.Queue()
-        self.text_queue: asyncio.Queue = asyncio.Queue()  # For clipboard paste
+        # Work from the pynput thread: appended there, drained by capture_mode,
+        # which sleeps on _wake until a producer (or stop/disconnect) sets it
+        self.key_buf: collections.deque = collections.deque()
+        self.text_buf: collections.deque = collections.deque()  # For clipboard paste
+        self._wake = asyncio.Event()
         self.chunk_size = 18  # Default, will be updated after MTU negotiation
+        # Acknowledge every Nth chunk as a barrier; measured at connect unless given
+        self.ack_every = max(1, ack_every) if ack_every else 16
+        self._auto_ack = not ack_every
+        self.reliable = reliable  # Acknowledge every chunk
+        self.no_delay = no_delay  # Send each captured key on its own (no batching)
+        # Resolved at connect so hot paths skip the UUID lookup and backend call
+        self._connected = False
+        self._text_char = None
+        self._hid_char = None
+        self._hid_buf = bytearray(2)  # Single key event for send_hid_key
 
     async def scan_and_connect(self, timeout: float = 10.0) -> bool:
         """Scan for the KeyBridge device and connect."""
@@ -180,117 +287,252 @@ class KeyBridgeClient:
         self.device = device
 
         self.client = BleakClient(device, disconnected_callback=self._on_disconnect)
+        # Interval parameters are only read when a connection is created, and
+        # only on the adapter that makes it: the one the dongle was found on
+        saved_interval = request_low_latency_interval(bluez_adapter(device))
 
         try:
-            await self.client.connect()
-            # Get the negotiated MTU (bleak auto-negotiates max MTU)
+            try:
+                await self.client.connect()
+            finally:
+                restore_interval(saved_interval)
+            # BlueZ only reports the default MTU until it is explicitly acquired;
+            # CoreBluetooth and WinRT negotiate during connect
+            acquire_mtu = getattr(self.client._backend, '_acquire_mtu', None)
+            if acquire_mtu is not None:
+                try:
+                    await acquire_mtu()
+                except Exception:
+                    pass
+            # Get the negotiated MTU
             mtu = self.client.mtu_size
             self.chunk_size = mtu - 3  # MTU - 3 for ATT header
+            self._text_char = self.client.services.get_characteristic(CHAR_TEXT_UUID)
+            self._hid_char = self.client.services.get_characteristic(CHAR_HID_UUID)
+            self._connected = True
+            # --reliable acknowledges every chunk, so there is no window to size
+            if self._auto_ack and not self.reliable:
+                await self._calibrate_ack_every()
             print(f"Connected to {device.name} (MTU: {mtu}, chunk: {self.chunk_size})")
             return True
         except Exception as e:
             print(f"Failed to connect: {e}")
             return False
 
+    async def _calibrate_ack_every(self):
+        """Size ack_every from the link's round trip; on any error the default is kept."""
+        measured = await measure_ack_every(self.client, self.chunk_size)
+        if measured is None:
+            return
+        self.ack_every, rtt = measured
+        print(f"Round trip {rtt * 1000:.1f} ms, acknowledging every {self.ack_every} chunks")
+
     def _on_disconnect(self, client: BleakClient):
         """Handle disconnection."""
         print("\nDisconnected from device")
+        self._connected = False
+        self.running = False
+        self._wake.set()
+
+    def stop(self):
+        """Ask capture mode to exit."""
         self.running = False
+        self._wake.set()
 
     async def send_text(self, text: str, slow_mode: bool = False):
         """Send text to be typed on target."""
-        if not self.client or not self.client.is_connected:
+        if not self._connected:
             print("Not connected")
             return
 
         # Convert all non-ASCII to ASCII
         text = convert_to_ascii(text)
 
-        # Check for non-ASCII characters
-        non_ascii = [(i, c, ord(c)) for i, c in enumerate(text) if ord(c) > 127]
-        if non_ascii:
+        # The device only types ASCII: encode once, dropping anything else
+        encoded = text.encode('ascii', errors='ignore')
+        if len(encoded) != len(text):
+            # Rare path: only scan for the details when something was dropped
+            non_ascii = [(i, c, ord(c)) for i, c in enumerate(text) if ord(c) > 127]
             print(f"Warning: {len(non_ascii)} non-ASCII characters found (will be skipped):")
             for pos, char, code in non_ascii[:10]:
                 print(f"  Position {pos}: '{char}' (U+{code:04X})")
             if len(non_ascii) > 10:
                 print(f"  ... and {len(non_ascii) - 10} more")
 
-        encoded = text.encode('utf-8')
-
         if slow_mode:
             # Send one character at a time (for debugging)
             print(f"SLOW MODE: Sending {len(encoded)} bytes one at a time...")
             for i, byte in enumerate(encoded):
                 c = chr(byte) if 32 <= byte < 127 else f'[{byte:02x}]'
                 print(f"  [{i}] Sending byte {byte:02x} ({c})")
-                await self.client.write_gatt_char(CHAR_TEXT_UUID, bytes([byte]), response=True)
+                await self.client.write_gatt_char(self._text_char, bytes([byte]), response=True)
                 await asyncio.sleep(0.05)  # 50ms between chars for visibility
         else:
-            # Send in chunks with acknowledgment for reliability
-            total_chunks = (len(encoded) + self.chunk_size - 1) // self.chunk_size
-            print(f"Sending {len(encoded)} bytes in {total_chunks} chunks (chunk_size={self.chunk_size})...")
+            cs = self.chunk_size
+            total_chunks = -(-len(encoded) // cs)
+            print(f"Sending {len(encoded)} bytes in {total_chunks} chunks "
+                  f"(chunk_size={cs}, max {MAX_MTU - 3})...")
+            # Slice views instead of copying every chunk out of the payload
+            view = memoryview(encoded)
+            await self._send_chunks(view[i:i + cs] for i in range(0, len(view), cs))
 
-            # Flow control: track firmware buffer free space via notifications
-            FIRMWARE_BUFFER = 65535  # Exact usable buffer (64KB - 1)
-            SEND_THRESHOLD = 4096   # Pause sending if fewer than 4KB free
+        print(f"Sent {len(text)} characters ({len(encoded)} bytes)")
 
-            buffer_event = asyncio.Event()
-            buffer_event.set()
-            current_free = [FIRMWARE_BUFFER]
+    async def send_file_stream(self, file_path: str) -> bool:
+        """Stream a text file to be typed on target without loading it whole."""
+        if not self._connected:
+            print("Not connected")
+            return False
 
-            # Read actual buffer status from firmware
-            try:
-                raw = await asyncio.wait_for(
-                    self.client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0)
-                val = int.from_bytes(raw, 'little')
-                if val > 0:
-                    current_free[0] = val
-            except Exception:
-                pass
-
-            def status_callback(sender, data):
-                current_free[0] = int.from_bytes(data, 'little')
-                buffer_event.set()
-
-            await self.client.start_notify(CHAR_STATUS_UUID, status_callback)
-            try:
-                for i in range(0, len(encoded), self.chunk_size):
-                    chunk = encoded[i:i + self.chunk_size]
+        try:
+            with open(file_path, 'rb') as f:
+                if looks_binary(f.read(8192)):
+                    print(f"Error: File appears to be binary: {file_path}")
+                    return False
+                f.seek(0)
+
+                size = os.fstat(f.fileno()).st_size
+                print(f"Streaming file: {file_path} ({size} bytes, chunk_size={self.chunk_size})...")
+                # Text mode gives incremental UTF-8 decoding and universal newlines
+                stream = io.TextIOWrapper(f, encoding='utf-8', errors='replace')
+                sent = await self._send_chunks(self._iter_ascii_chunks(stream))
+        except (OSError, IOError) as e:
+            print(f"Error reading file: {e}")
+            return False
 
-                    # Wait if not enough free space
-                    while current_free[0] < SEND_THRESHOLD:
-                        buffer_event.clear()
+        print(f"Sent {sent} bytes")
+        return True
+
+    def _iter_ascii_chunks(self, stream):
+        """Yield ASCII-converted chunks of at most chunk_size bytes from a text stream."""
+        while True:
+            text = stream.read(self.chunk_size)
+            if not text:
+                return
+            # Conversion never grows a chunk: every non-ASCII char maps to <= its UTF-8 size
+            chunk = convert_to_ascii(text).encode('ascii', errors='ignore')
+            if chunk:
+                yield chunk
+
+    async def _send_chunks(self, chunks) -> int:
+        """
+        Write chunks (each at most chunk_size bytes) to the text characteristic.
+
+        Chunks go out without response, acknowledging every ack_every-th chunk
+        (and the last) as a barrier, and pausing while the firmware buffer is full.
+        Returns the number of bytes sent.
+        """
+        # Flow control: track firmware buffer free space via notifications
+        FIRMWARE_BUFFER = 65535  # Exact usable buffer (64KB - 1)
+        SEND_THRESHOLD = 4096   # Pause sending if fewer than 4KB free
+
+        buffer_event = asyncio.Event()
+        buffer_event.set()
+        current_free = [FIRMWARE_BUFFER]
+
+        # Read actual buffer status from firmware
+        try:
+            raw = await asyncio.wait_for(
+                self.client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0)
+            val = int.from_bytes(raw, 'little')
+            if val > 0:
+                current_free[0] = val
+        except Exception:
+            pass
+
+        def status_callback(sender, data):
+            current_free[0] = int.from_bytes(data, 'little')
+            buffer_event.set()
+
+        sent = 0
+        await self.client.start_notify(CHAR_STATUS_UUID, status_callback)
+        try:
+            # One chunk of lookahead so the last chunk can be acknowledged
+            chunks = iter(chunks)
+            chunk = next(chunks, None)
+            n = 0
+            while chunk is not None:
+                next_chunk = next(chunks, None)
+
+                # Wait if not enough free space
+                while current_free[0] < SEND_THRESHOLD:
+                    buffer_event.clear()
+                    try:
+                        await asyncio.wait_for(buffer_event.wait(), timeout=5.0)
+                    except asyncio.TimeoutError:
                         try:
-                            await asyncio.wait_for(buffer_event.wait(), timeout=5.0)
-                        except asyncio.TimeoutError:
-                            try:
-                                raw = await asyncio.wait_for(
-                                    self.client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0)
-                                current_free[0] = int.from_bytes(raw, 'little')
-                            except Exception:
-                                current_free[0] = max(current_free[0], SEND_THRESHOLD)
-                            if current_free[0] < SEND_THRESHOLD:
-                                continue
-                            break
-
-                    current_free[0] = max(0, current_free[0] - len(chunk))
-
-                    await asyncio.wait_for(
-                        self.client.write_gatt_char(CHAR_TEXT_UUID, chunk, response=True),
-                        timeout=10.0
-                    )
-            finally:
-                await self.client.stop_notify(CHAR_STATUS_UUID)
+                            raw = await asyncio.wait_for(
+                                self.client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0)
+                            current_free[0] = int.from_bytes(raw, 'little')
+                        except Exception:
+                            current_free[0] = max(current_free[0], SEND_THRESHOLD)
+                        if current_free[0] < SEND_THRESHOLD:
+                            continue
+                        break
+
+                current_free[0] = max(0, current_free[0] - len(chunk))
+
+                response = (self.reliable
+                            or n % self.ack_every == self.ack_every - 1
+                            or next_chunk is None)
+                await asyncio.wait_for(
+                    self.client.write_gatt_char(self._text_char, chunk, response=response),
+                    timeout=10.0
+                )
+                sent += len(chunk)
+                chunk = next_chunk
+                n += 1
+        finally:
+            await self.client.stop_notify(CHAR_STATUS_UUID)
 
-        print(f"Sent {len(text)} characters ({len(encoded)} bytes)")
+        return sent
+
+    async def send_base64(self, prefix: str, data: bytes, suffix: str, newline: bool = False):
+        """
+        Type prefix, data as base64, then suffix, encoding the data one chunk at a time.
+
+        With newline=True every encoded block ends in a newline.
+        """
+        if not self._connected:
+            print("Not connected")
+            return
+
+        cs = self.chunk_size
+        # Whole base64 quanta (3 raw -> 4 encoded bytes) so each block fits one write
+        step = 3 * ((cs - newline) // 4)
+
+        def chunks():
+            head = prefix.encode('ascii', errors='ignore')
+            for i in range(0, len(head), cs):
+                yield head[i:i + cs]
+            view = memoryview(data)
+            for i in range(0, len(view), step):
+                yield binascii.b2a_base64(view[i:i + step], newline=newline)
+            tail = suffix.encode('ascii', errors='ignore')
+            for i in range(0, len(tail), cs):
+                yield tail[i:i + cs]
+
+        sent = await self._send_chunks(chunks())
+        print(f"Sent {sent} bytes")
 
     async def send_hid_key(self, modifiers: int, keycode: int):
         """Send a raw HID key event."""
-        if not self.client or not self.client.is_connected:
+        if not self._connected:
             return
 
-        data = bytes([modifiers, keycode])
-        await self.client.write_gatt_char(CHAR_HID_UUID, data)
+        # Reused buffer; the write is awaited before it can be refilled
+        buf = self._hid_buf
+        buf[0] = modifiers
+        buf[1] = keycode
+        await self.client.write_gatt_char(self._hid_char, buf)
+
+    async def send_hid_keys(self, events):
+        """Send several (modifiers, keycode) events in one batched HID write."""
+        if not self._connected:
+            return
+
+        data = bytes(b for event in events for b in event)
+        await self.client.write_gatt_char(self._hid_char, data, response=False)
 
     async def capture_mode(self):
         """
@@ -306,6 +548,7 @@ class KeyBridgeClient:
             return
 
         self.running = True
+        loop = asyncio.get_running_loop()
         print("\nCapture mode active. Press Ctrl+C to exit.")
         print("All keystrokes forwarded. Cmd+V pastes clipboard.")
         print("-" * 50)
@@ -313,36 +556,43 @@ class KeyBridgeClient:
         # Track modifier state
         modifiers = 0
 
+        # pynput key objects to modifier bits and HID keycodes: one hash lookup
+        # per event instead of a chain of comparisons
+        key_to_modbit = {
+            keyboard.Key.ctrl_l: MOD_LCTRL, keyboard.Key.ctrl_r: MOD_LCTRL,
+            keyboard.Key.shift_l: MOD_LSHIFT, keyboard.Key.shift: MOD_LSHIFT,
+            keyboard.Key.shift_r: MOD_RSHIFT,
+            keyboard.Key.alt_l: MOD_LALT, keyboard.Key.alt: MOD_LALT,
+            keyboard.Key.alt_r: MOD_RALT,
+            keyboard.Key.cmd_l: MOD_LGUI, keyboard.Key.cmd: MOD_LGUI,  # Cmd also drives paste detection
+            keyboard.Key.cmd_r: MOD_RGUI,
+        }
+        special_key_to_hid = {
+            keyboard.Key.space: 0x2C, keyboard.Key.enter: 0x28,
+            keyboard.Key.backspace: 0x2A, keyboard.Key.tab: 0x2B,
+            keyboard.Key.esc: 0x29, keyboard.Key.delete: 0x4C,
+            keyboard.Key.up: 0x52, keyboard.Key.down: 0x51,
+            keyboard.Key.left: 0x50, keyboard.Key.right: 0x4F,
+            keyboard.Key.home: 0x4A, keyboard.Key.end: 0x4D,
+            keyboard.Key.page_up: 0x4B, keyboard.Key.page_down: 0x4E,
+        }
+
+        def queue_key(mods, keycode):
+            # deque.append is atomic; only the wakeup has to hop onto the loop
+            self.key_buf.append((mods, keycode))
+            loop.call_soon_threadsafe(self._wake.set)
+
         def on_press(key):
             nonlocal modifiers
 
             try:
                 # Handle modifier keys
-                if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                    modifiers |= MOD_LCTRL
-                    return
-                elif key == keyboard.Key.shift_l or key == keyboard.Key.shift:
-                    modifiers |= MOD_LSHIFT
-                    return
-                elif key == keyboard.Key.shift_r:
-                    modifiers |= MOD_RSHIFT
-                    return
-                elif key == keyboard.Key.alt_l or key == keyboard.Key.alt:
-                    modifiers |= MOD_LALT
-                    return
-                elif key == keyboard.Key.alt_r:
-                    modifiers |= MOD_RALT
-                    return
-                elif key == keyboard.Key.cmd_l or key == keyboard.Key.cmd:
-                    # Track Cmd for paste detection
-                    modifiers |= MOD_LGUI
-                    return
-                elif key == keyboard.Key.cmd_r:
-                    modifiers |= MOD_RGUI
+                bit = key_to_modbit.get(key)
+                if bit:
+                    modifiers |= bit
                     return
 
                 # Get the keycode
-                keycode = 0
                 char = None
                 current_mods = modifiers
                 cmd_pressed = (modifiers & (MOD_LGUI | MOD_RGUI)) != 0
@@ -351,7 +601,8 @@ class KeyBridgeClient:
                 if cmd_pressed and hasattr(key, 'char') and key.char == 'v':
                     clipboard = get_clipboard()
                     if clipboard:
-                        self.text_queue.put_nowait(clipboard)
+                        self.text_buf.append(clipboard)
+                        loop.call_soon_threadsafe(self._wake.set)
                     return
 
                 # Check for Cmd+C (copy) - just ignore, let Mac handle it
@@ -363,59 +614,29 @@ class KeyBridgeClient:
                     current_mods = (current_mods & ~(MOD_LGUI | MOD_RGUI)) | MOD_LCTRL
 
                 # Handle special keys explicitly
-                if key == keyboard.Key.space:
-                    keycode = 0x2C
-                elif key == keyboard.Key.enter:
-                    keycode = 0x28
-                elif key == keyboard.Key.backspace:
-                    keycode = 0x2A
-                elif key == keyboard.Key.tab:
-                    keycode = 0x2B
-                elif key == keyboard.Key.esc:
-                    keycode = 0x29
-                elif key == keyboard.Key.delete:
-                    keycode = 0x4C
-                elif key == keyboard.Key.up:
-                    keycode = 0x52
-                elif key == keyboard.Key.down:
-                    keycode = 0x51
-                elif key == keyboard.Key.left:
-                    keycode = 0x50
-                elif key == keyboard.Key.right:
-                    keycode = 0x4F
-                elif key == keyboard.Key.home:
-                    keycode = 0x4A
-                elif key == keyboard.Key.end:
-                    keycode = 0x4D
-                elif key == keyboard.Key.page_up:
-                    keycode = 0x4B
-                elif key == keyboard.Key.page_down:
-                    keycode = 0x4E
-                elif hasattr(key, 'char') and key.char:
-                    char = key.char
-                elif hasattr(key, 'name'):
-                    char = key.name
+                keycode = special_key_to_hid.get(key, 0)
+                if not keycode:
+                    char = getattr(key, 'char', None) or getattr(key, 'name', None)
 
                 # If we got a keycode from special key handling, queue it
                 if keycode:
-                    self.key_queue.put_nowait((current_mods, keycode))
+                    queue_key(current_mods, keycode)
                     return
 
                 if char:
-                    # Preserve existing modifiers and add shift if needed
-                    current_mods = modifiers
-                    if char in SHIFT_CHARS:
-                        base_char = SHIFT_CHARS[char]
-                        current_mods |= MOD_LSHIFT  # Add shift, preserving other mods
-                        char = base_char
-
-                    # Look up HID keycode
-                    char_lower = char.lower() if len(char) == 1 else char
-                    keycode = MAC_KEY_TO_HID.get(char_lower, 0)
+                    if len(char) == 1 and ord(char) < 256:
+                        # Table lookup; adds shift if needed, preserving other mods
+                        mod, keycode = ASCII_TO_MOD_KC[ord(char)]
+                        current_mods = modifiers | mod
+                    else:
+                        # Named keys and other characters
+                        char_lower = char.lower() if len(char) == 1 else char
+                        keycode = MAC_KEY_TO_HID.get(char_lower, 0)
+                        current_mods = modifiers
 
                     if keycode:
                         # Queue the key event with preserved modifiers
-                        self.key_queue.put_nowait((current_mods, keycode))
+                        queue_key(current_mods, keycode)
 
             except Exception as e:
                 print(f"Key error: {e}")
@@ -424,46 +645,38 @@ class KeyBridgeClient:
             nonlocal modifiers
 
             # Clear modifier flags
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                modifiers &= ~MOD_LCTRL
-            elif key == keyboard.Key.shift_l or key == keyboard.Key.shift:
-                modifiers &= ~MOD_LSHIFT
-            elif key == keyboard.Key.shift_r:
-                modifiers &= ~MOD_RSHIFT
-            elif key == keyboard.Key.alt_l or key == keyboard.Key.alt:
-                modifiers &= ~MOD_LALT
-            elif key == keyboard.Key.alt_r:
-                modifiers &= ~MOD_RALT
-            elif key == keyboard.Key.cmd_l or key == keyboard.Key.cmd:
-                modifiers &= ~MOD_LGUI
-            elif key == keyboard.Key.cmd_r:
-                modifiers &= ~MOD_RGUI
+            bit = key_to_modbit.get(key)
+            if bit:
+                modifiers &= ~bit
 
         # Start keyboard listener
         listener = keyboard.Listener(on_press=on_press, on_release=on_release)
         listener.start()
 
         try:
-            while self.running and self.client and self.client.is_connected:
-                # Check for clipboard paste text first
-                try:
-                    text = self.text_queue.get_nowait()
-                    await self.send_text(text)
+            while self.running and self._connected:
+                if not self.text_buf and not self.key_buf:
+                    await self._wake.wait()
+                # Clear before draining so a wakeup for later work isn't lost
+                self._wake.clear()
+
+                # Clipboard paste text first
+                if self.text_buf:
+                    await self.send_text(self.text_buf.popleft())
+                    continue
+                if not self.key_buf:
                     continue
-                except asyncio.QueueEmpty:
-                    pass
 
-                # Check for key events
-                try:
-                    mods, keycode = await asyncio.wait_for(
-                        self.key_queue.get(),
-                        timeout=0.05
-                    )
-                    await self.send_hid_key(mods, keycode)
-                except asyncio.TimeoutError:
+                if self.no_delay:
+                    await self.send_hid_key(*self.key_buf.popleft())
                     continue
-                except asyncio.CancelledError:
-                    break
+
+                # Coalesce any backlog into one write (2 bytes per event)
+                events = []
+                max_events = max(1, self.chunk_size // 2)
+                while self.key_buf and len(events) < max_events:
+                    events.append(self.key_buf.popleft())
+                await self.send_hid_keys(events)
         finally:
             listener.stop()
             print("\nCapture mode ended")
@@ -496,18 +709,11 @@ class KeyBridgeClient:
 
     async def send_keys(self, text: str, delay: float = 0.05):
         """Send text character by character via HID (slower but more reliable for commands)."""
-        for char in text:
-            modifiers = 0
-            if char in SHIFT_CHARS:
-                modifiers = MOD_LSHIFT
-                char = SHIFT_CHARS[char]
-
-            keycode = MAC_KEY_TO_HID.get(char.lower(), 0)
+        # Non-ASCII characters encode to bytes >= 0x80, which have no keycode
+        for b in text.encode('utf-8'):
+            keycode = ASCII_TO_HID[b]
             if keycode:
-                await self.send_hid_key(modifiers, keycode)
-                await asyncio.sleep(delay)
-            elif char == '\n':
-                await self.send_hid_key(0, 0x28)  # Enter
+                await self.send_hid_key(ASCII_TO_MOD[b], keycode)
                 await asyncio.sleep(delay)
 
     async def save_file_windows(self, content: str, filename: str):
@@ -538,9 +744,9 @@ class KeyBridgeClient:
         encoded_cmd = base64.b64encode(ps_cmd.encode('utf-16-le')).decode('ascii')
 
         print(f"Saving {safe_filename} ({len(content)} chars)...")
-        cmd = f"powershell -EncodedCommand {encoded_cmd}"
-        await self.send_keys(cmd)
-        await self.send_key_combo(0x28)  # Enter
+        # Bulk text path; the trailing newline is typed as Enter after the command
+        cmd = f"powershell -EncodedCommand {encoded_cmd}\n"
+        await self.send_text(cmd)
         await asyncio.sleep(0.5)
 
         print(f"Saved to Documents\\{safe_filename}")
@@ -549,16 +755,13 @@ class KeyBridgeClient:
         """
         Save binary file on Windows using PowerShell with proper encoding.
         """
-        import base64
-
         # Sanitize filename - only allow alphanumerics, dash, underscore, dot
         # This filter prevents path traversal and special character injection
         safe_filename = "".join(c for c in filename if c.isalnum() or c in '.-_')
         if not safe_filename:
             safe_filename = "file.bin"
 
-        b64_data = base64.b64encode(data).decode('ascii')
-        print(f"Saving {safe_filename} ({len(data)} bytes as {len(b64_data)} base64 chars)...")
+        print(f"Saving {safe_filename} ({len(data)} bytes as {base64_length(data)} base64 chars)...")
 
         print("Opening PowerShell on Windows...")
 
@@ -571,13 +774,10 @@ class KeyBridgeClient:
         await self.send_key_combo(0x28)  # Enter
         await asyncio.sleep(1.0)  # Wait for PowerShell to open
 
-        # Build PowerShell command using -EncodedCommand with base64
-        ps_cmd = f"[System.IO.File]::WriteAllBytes([System.IO.Path]::Combine($HOME, 'Documents', '{safe_filename}'), [System.Convert]::FromBase64String('{b64_data}'))"
-        encoded_cmd = base64.b64encode(ps_cmd.encode('utf-16-le')).decode('ascii')
-
-        cmd = f"powershell -EncodedCommand {encoded_cmd}"
-        await self.send_keys(cmd)
-        await self.send_key_combo(0x28)  # Enter
+        # Type the command directly so the base64 can be encoded as it is sent
+        # (the filename is sanitized and base64 never contains a quote)
+        prefix = f"[System.IO.File]::WriteAllBytes([System.IO.Path]::Combine($HOME, 'Documents', '{safe_filename}'), [System.Convert]::FromBase64String('"
+        await self.send_base64(prefix, data, "'))\n")
         await asyncio.sleep(0.5)
 
         print(f"Saved to Documents\\{safe_filename}")
@@ -596,50 +796,30 @@ class KeyBridgeClient:
         # Use unique delimiter to avoid conflicts with content
         delimiter = f"EOF_{int(time.time() * 1000)}"
 
-        # Use cat with heredoc (single quotes prevent expansion)
-        await self.send_keys(f"cat > {safe_filename} << '{delimiter}'")
-        await self.send_key_combo(0x28)  # Enter
-        await asyncio.sleep(0.1)
-
-        # Type the content
-        await self.send_text(content)
-
-        # End heredoc with unique delimiter
-        await self.send_key_combo(0x28)  # Enter
-        await self.send_keys(delimiter)
-        await self.send_key_combo(0x28)  # Enter
+        # Use cat with heredoc (single quotes prevent expansion). Command, content
+        # and delimiter go through one text send so the firmware types them in order
+        await self.send_text(f"cat > {safe_filename} << '{delimiter}'\n{content}\n{delimiter}\n")
         print(f"Saved to {safe_filename}")
 
     async def save_binary_linux(self, data: bytes, filename: str):
         """
         Save binary file on Linux using base64 with safe filename handling.
         """
-        import base64
-
         # Sanitize filename - only allow safe characters (no / to prevent path traversal)
         safe_filename = "".join(c for c in filename if c.isalnum() or c in '.-_')
         if not safe_filename:
             safe_filename = "file.bin"
 
-        b64_data = base64.b64encode(data).decode('ascii')
-
-        print(f"Saving {safe_filename} on Linux ({len(data)} bytes as {len(b64_data)} base64 chars)...")
+        print(f"Saving {safe_filename} on Linux ({len(data)} bytes as {base64_length(data)} base64 chars)...")
 
         # Use unique delimiter and safe filename
         delimiter = f"EOF_{int(time.time() * 1000)}"
 
-        # Use cat with heredoc for base64 data (safer than echo)
-        await self.send_keys(f"cat << '{delimiter}' | base64 -d > {safe_filename}")
-        await self.send_key_combo(0x28)  # Enter
-        await asyncio.sleep(0.1)
-
-        # Send base64 data
-        await self.send_text(b64_data)
-
-        # End heredoc
-        await self.send_key_combo(0x28)  # Enter
-        await self.send_keys(delimiter)
-        await self.send_key_combo(0x28)  # Enter
+        # Use cat with heredoc for base64 data (safer than echo), sent as one text
+        # stream so the firmware types command, data and delimiter in order
+        # One base64 line per chunk keeps terminal lines short; base64 -d skips newlines
+        await self.send_base64(f"cat << '{delimiter}' | base64 -d > {safe_filename}\n",
+                               data, f"{delimiter}\n", newline=True)
         await asyncio.sleep(0.3)
         print(f"Saved to {safe_filename}")
 
@@ -681,6 +861,22 @@ async def main():
         action="store_true",
         help="Slow mode: send one character at a time with debug output"
     )
+    parser.add_argument(
+        "--ack-every",
+        type=int,
+        default=None,
+        help="Acknowledge every Nth chunk when sending text (default: tuned from measured round-trip time)"
+    )
+    parser.add_argument(
+        "--reliable",
+        action="store_true",
+        help="Acknowledge every chunk (slower, for flaky links)"
+    )
+    parser.add_argument(
+        "--no-delay",
+        action="store_true",
+        help="Capture mode: send every key on its own instead of batching backlog"
+    )
     parser.add_argument(
         "--saveon",
         type=str,
@@ -698,14 +894,23 @@ async def main():
     # Default to capture mode if no text/file specified (or explicit -c)
     capture_mode = args.capture or (not args.text and not args.file)
 
-    client = KeyBridgeClient()
+    client = KeyBridgeClient(ack_every=args.ack_every, reliable=args.reliable,
+                             no_delay=args.no_delay)
 
-    # Handle Ctrl+C
-    def signal_handler(sig, frame):
+    # Handle Ctrl+C: cancel whatever main is awaiting (e.g. a long write)
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+
+    def on_interrupt():
         print("\nExiting...")
-        client.running = False
+        client.stop()
+        main_task.cancel()
 
-    signal.signal(signal.SIGINT, signal_handler)
+    try:
+        loop.add_signal_handler(signal.SIGINT, on_interrupt)
+    except NotImplementedError:
+        # Windows event loops have no add_signal_handler; hop onto the loop instead
+        signal.signal(signal.SIGINT, lambda sig, frame: loop.call_soon_threadsafe(on_interrupt))
 
     try:
         # Connect to device
@@ -716,33 +921,40 @@ async def main():
             # File mode
             filename = args.name if args.name else os.path.basename(args.file)
 
+            if args.saveon or args.slow:
+                # Read the file once; the binary check runs on the in-memory prefix
+                loaded = load_file(args.file)
+                if loaded is None:
+                    sys.exit(1)
+                data, binary = loaded
+
             if args.saveon:
                 # Save file on target system
                 target = args.saveon.lower()
-                binary = is_binary_file(args.file)
 
                 if binary:
-                    with open(args.file, 'rb') as f:
-                        data = f.read()
                     if target in ('windows', 'win'):
                         await client.save_binary_windows(data, filename)
                     elif target in ('linux', 'lin'):
                         await client.save_binary_linux(data, filename)
                 else:
-                    text = read_text_file(args.file)
-                    if text is None:
-                        sys.exit(1)
+                    text = decode_text(data)
                     if target in ('windows', 'win'):
                         await client.save_file_windows(text, filename)
                     elif target in ('linux', 'lin'):
                         await client.save_file_linux(text, filename)
-            else:
-                # Just type the content (text only)
-                text = read_text_file(args.file)
-                if text is None:
+            elif args.slow:
+                # Just type the content (text only), one character at a time
+                if binary:
+                    print(f"Error: File appears to be binary: {args.file}")
                     sys.exit(1)
+                text = decode_text(data)
                 print(f"Sending file: {args.file} ({len(text)} chars)")
-                await client.send_text(text, slow_mode=args.slow)
+                await client.send_text(text, slow_mode=True)
+            else:
+                # Just type the content (text only), streamed from disk
+                if not await client.send_file_stream(args.file):
+                    sys.exit(1)
 
         elif args.text:
             # Text mode
@@ -766,6 +978,8 @@ async def main():
             # Capture mode (default)
             await client.capture_mode()
 
+    except asyncio.CancelledError:
+        pass
     finally:
         await client.disconnect()
 
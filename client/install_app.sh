@@ -45,4 +45,4 @@ echo ""
 echo "⌨️  The app will appear in your menu bar (⌨️)"
 echo "   • Double-click to send clipboard content"
 echo "   • Single-click for menu"
-echo "   • Use Fn+Cmd+V hotkey to send clipboard"
\ No newline at end of file
+echo "   • Use Ctrl+Cmd+V hotkey to send clipboard"
\ No newline at end of file
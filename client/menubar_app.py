@@ -3,21 +3,19 @@
 LilyGo KeyBridge Menu Bar App
 
 A macOS menu bar application for sending clipboard content to the KeyBridge dongle.
-Double-click on icon: connect → send clipboard → disconnect
+Double-click on icon: connect → send clipboard (connection kept warm between sends)
 Single-click: show menu
 """
 
-import asyncio
-import atexit
+import ctypes
 import signal
-import subprocess
 import sys
 import threading
 import time
 import unicodedata
-from typing import Optional
+import uuid
 
-from bleak import BleakClient, BleakScanner, BleakError
+from ble_core import DEBUG, RELIABLE, BleSender
 
 
 # Unicode to ASCII character mappings
@@ -242,24 +240,45 @@ def convert_to_ascii(text: str) -> str:
 
 
 import objc
-from Foundation import NSObject, NSRunLoop, NSDate, NSTimer
+from Foundation import (
+    NSBundle,
+    NSObject,
+    NSOperationQueue,
+    NSRunLoop,
+    NSRunLoopCommonModes,
+    NSDate,
+    NSTimer,
+    NSUserNotification,
+    NSUserNotificationCenter,
+)
 from AppKit import (
     NSApplication,
     NSStatusBar,
     NSMenu,
     NSMenuItem,
     NSVariableStatusItemLength,
-    NSImage,
+    NSPasteboard,
+    NSPasteboardTypeString,
 )
 from PyObjCTools import AppHelper
-from pynput import keyboard
-
-# BLE UUIDs (must match firmware)
-SERVICE_UUID = "4fafc201-1fb5-459e-8fcc-c5c9c331914b"
-CHAR_TEXT_UUID = "beb5483e-36e1-4688-b7f5-ea07361b26a8"
-CHAR_STATUS_UUID = "beb5483e-36e1-4688-b7f5-ea07361b26aa"
 
-DEVICE_NAME = "KeyBridge"
+try:
+    from UserNotifications import (
+        UNAuthorizationOptionAlert,
+        UNAuthorizationOptionSound,
+        UNMutableNotificationContent,
+        UNNotificationRequest,
+        UNUserNotificationCenter,
+    )
+except ImportError:
+    UNUserNotificationCenter = None
+
+# Menu bar titles for each BleSender state
+STATUS_TITLES = {
+    "connecting": "⌨️🔗",
+    "sending": "⌨️📤",
+    "waiting": "⌨️⏳",
+}
 
 # Global delegate reference
 _delegate = None
@@ -273,42 +292,159 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
-def get_clipboard():
-    """Get clipboard content on macOS."""
-    try:
-        result = subprocess.run(["pbpaste"], capture_output=True, text=False, timeout=2)
-        return result.stdout.decode("utf-8", errors="replace")
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        return None
+def get_clipboard(pasteboard=None):
+    """Get clipboard text on macOS straight from the general pasteboard."""
+    pasteboard = pasteboard or NSPasteboard.generalPasteboard()
+    text = pasteboard.stringForType_(NSPasteboardTypeString)
+    return str(text or "")
 
 
-def escape_applescript(s):
-    """Escape special characters for AppleScript strings."""
-    # Escape backslash first, then double quotes
-    s = s.replace("\\", "\\\\")
-    s = s.replace('"', '\\"')
-    return s
+def _notification_center():
+    """Return the UNUserNotificationCenter, or None when it can't be used."""
+    # The center raises outside an app bundle (e.g. when run from a terminal)
+    if UNUserNotificationCenter is None or not NSBundle.mainBundle().bundleIdentifier():
+        return None
+    return UNUserNotificationCenter.currentNotificationCenter()
 
 
 def send_notification(title, subtitle, message):
     """Send macOS notification."""
-    try:
-        # Escape all string interpolations to prevent AppleScript injection
-        safe_title = escape_applescript(title)
-        safe_subtitle = escape_applescript(subtitle)
-        safe_message = escape_applescript(message)
-
-        subprocess.run(
-            [
-                "osascript",
-                "-e",
-                f'display notification "{safe_message}" with title "{safe_title}" subtitle "{safe_subtitle}"',
-            ],
-            capture_output=True,
-            timeout=2,
+    center = _notification_center()
+    if center is not None:
+        content = UNMutableNotificationContent.alloc().init()
+        content.setTitle_(title)
+        content.setSubtitle_(subtitle)
+        content.setBody_(message)
+        # A nil trigger delivers the notification immediately
+        request = UNNotificationRequest.requestWithIdentifier_content_trigger_(
+            str(uuid.uuid4()), content, None
         )
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        pass  # Silent fail - not critical
+        center.addNotificationRequest_withCompletionHandler_(request, None)
+        return
+
+    # Pre-UserNotifications fallback; both centers are nil when unbundled
+    legacy_center = NSUserNotificationCenter.defaultUserNotificationCenter()
+    if legacy_center is not None:
+        notification = NSUserNotification.alloc().init()
+        notification.setTitle_(title)
+        notification.setSubtitle_(subtitle)
+        notification.setInformativeText_(message)
+        legacy_center.deliverNotification_(notification)
+        return
+
+    print(f"[NOTIFY] {title}: {subtitle} - {message}")
+
+
+# Carbon hotkey constants (HIToolbox Events.h / CarbonEvents.h)
+CARBON_PATH = "/System/Library/Frameworks/Carbon.framework/Carbon"
+kVK_ANSI_V = 0x09
+cmdKey = 0x0100
+controlKey = 0x1000
+kEventClassKeyboard = int.from_bytes(b"keyb", "big")
+kEventHotKeyPressed = 5
+
+
+class _EventTypeSpec(ctypes.Structure):
+    _fields_ = [("eventClass", ctypes.c_uint32), ("eventKind", ctypes.c_uint32)]
+
+
+class _EventHotKeyID(ctypes.Structure):
+    _fields_ = [("signature", ctypes.c_uint32), ("id", ctypes.c_uint32)]
+
+
+_EventHandlerProc = ctypes.CFUNCTYPE(
+    ctypes.c_int32, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p
+)
+
+
+class CarbonHotKey:
+    """System-wide hotkey via Carbon's RegisterEventHotKey.
+
+    Unlike a keyboard listener, the callback only runs when the exact
+    key combination is pressed, not on every keystroke.
+    """
+
+    def __init__(self, keycode, modifiers, callback):
+        self.keycode = keycode
+        self.modifiers = modifiers
+        self.callback = callback
+        self._carbon = None
+        self._handler_proc = None  # Keep a reference so ctypes doesn't free it
+        self._handler_ref = ctypes.c_void_p()
+        self._hotkey_ref = ctypes.c_void_p()
+
+    def register(self):
+        """Install the hotkey; return False if Carbon refuses it."""
+        try:
+            carbon = ctypes.cdll.LoadLibrary(CARBON_PATH)
+        except OSError:
+            return False
+
+        carbon.GetApplicationEventTarget.restype = ctypes.c_void_p
+        carbon.InstallEventHandler.argtypes = [
+            ctypes.c_void_p,
+            _EventHandlerProc,
+            ctypes.c_ulong,
+            ctypes.POINTER(_EventTypeSpec),
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.c_void_p),
+        ]
+        carbon.RegisterEventHotKey.argtypes = [
+            ctypes.c_uint32,
+            ctypes.c_uint32,
+            _EventHotKeyID,
+            ctypes.c_void_p,
+            ctypes.c_uint32,
+            ctypes.POINTER(ctypes.c_void_p),
+        ]
+        carbon.UnregisterEventHotKey.argtypes = [ctypes.c_void_p]
+        carbon.RemoveEventHandler.argtypes = [ctypes.c_void_p]
+
+        def handler(next_handler, event, user_data):
+            try:
+                self.callback()
+            except Exception as e:
+                print(f"[HOTKEY] Handler error: {e}")
+            return 0  # noErr
+
+        self._handler_proc = _EventHandlerProc(handler)
+        target = carbon.GetApplicationEventTarget()
+        spec = _EventTypeSpec(kEventClassKeyboard, kEventHotKeyPressed)
+
+        status = carbon.InstallEventHandler(
+            target,
+            self._handler_proc,
+            1,
+            ctypes.byref(spec),
+            None,
+            ctypes.byref(self._handler_ref),
+        )
+        if status != 0:
+            return False
+
+        hotkey_id = _EventHotKeyID(int.from_bytes(b"KBrg", "big"), 1)
+        status = carbon.RegisterEventHotKey(
+            self.keycode,
+            self.modifiers,
+            hotkey_id,
+            target,
+            0,
+            ctypes.byref(self._hotkey_ref),
+        )
+        if status != 0:
+            carbon.RemoveEventHandler(self._handler_ref)
+            return False
+
+        self._carbon = carbon
+        return True
+
+    def unregister(self):
+        """Remove the hotkey and its event handler."""
+        if self._carbon is None:
+            return
+        self._carbon.UnregisterEventHotKey(self._hotkey_ref)
+        self._carbon.RemoveEventHandler(self._handler_ref)
+        self._carbon = None
 
 
 class KeyBridgeDelegate(NSObject):
@@ -318,13 +454,18 @@ class KeyBridgeDelegate(NSObject):
             return None
 
         self.sending = False
-        self.loop = None
-        self.ble_thread = None
+        self.ble = None
         self.status_item = None
-        self.last_click_time = 0
+        self._last_title = None
+        self._title_queued = False
+        self._pasteboard = NSPasteboard.generalPasteboard()
+        self._last_change_count = -1
+        self._cached_bytes = b""
+        self.last_click_time = 0.0
         self.double_click_threshold = 0.4
         self.click_timer = None
         self.listener = None
+        self.hotkey = None
         self.ctrl_pressed = False
         self.cmd_pressed = False
 
@@ -338,6 +479,7 @@ class KeyBridgeDelegate(NSObject):
 
         # Set title
         self.status_item.setTitle_("⌨️")
+        self._last_title = "⌨️"
 
         # Enable button behavior for click detection
         button = self.status_item.button()
@@ -369,10 +511,48 @@ class KeyBridgeDelegate(NSObject):
         quit_item.setTarget_(self)
         self.menu.addItem_(quit_item)
 
+        # Single reusable timer for the single-click menu. It repeats so it stays
+        # valid after firing, and sits dormant until statusItemClicked_ re-arms it.
+        self.click_timer = NSTimer.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
+            NSDate.distantFuture(),
+            self.double_click_threshold,
+            self,
+            objc.selector(self.showMenuAfterDelay_, signature=b"v@:@"),
+            None,
+            True,
+        )
+        NSRunLoop.currentRunLoop().addTimer_forMode_(
+            self.click_timer, NSRunLoopCommonModes
+        )
+
+        # Ask once for permission to post notifications
+        center = _notification_center()
+        if center is not None:
+            center.requestAuthorizationWithOptions_completionHandler_(
+                UNAuthorizationOptionAlert | UNAuthorizationOptionSound,
+                lambda granted, error: None,
+            )
+
         # Start BLE thread
-        self._start_ble_thread()
+        self.ble = BleSender(
+            self._show_status, send_notification, self._reset_ui, reliable=RELIABLE
+        )
+        self.ble.start()
 
         # Setup global hotkey
+        self._setup_hotkey()
+
+    def _setup_hotkey(self):
+        """Register Ctrl+Cmd+V via Carbon, falling back to the pynput listener."""
+        hotkey = CarbonHotKey(
+            kVK_ANSI_V, controlKey | cmdKey, lambda: self.sendClipboard_(None)
+        )
+        if hotkey.register():
+            self.hotkey = hotkey
+            print("[HOTKEY] Carbon hotkey active: Press Ctrl+Cmd+V")
+            return
+
+        print("[HOTKEY] Carbon hotkey unavailable, using keyboard listener")
         self._setup_listener()
 
     def _setup_listener(self):
@@ -398,7 +578,8 @@ class KeyBridgeDelegate(NSObject):
                 # Handle V key (as character or Key enum)
                 elif hasattr(key, "char") and key.char == "v":
                     if self.ctrl_pressed and self.cmd_pressed:
-                        print("[HOTKEY] Ctrl+Cmd+V triggered!")
+                        if DEBUG:
+                            print("[HOTKEY] Ctrl+Cmd+V triggered!")
                         self.performSelectorOnMainThread_withObject_waitUntilDone_(
                             objc.selector(self.sendClipboard_, signature=b"v@:@"),
                             None,
@@ -406,7 +587,8 @@ class KeyBridgeDelegate(NSObject):
                         )
                 elif key == keyboard.Key.v:
                     if self.ctrl_pressed and self.cmd_pressed:
-                        print("[HOTKEY] Ctrl+Cmd+V triggered!")
+                        if DEBUG:
+                            print("[HOTKEY] Ctrl+Cmd+V triggered!")
                         self.performSelectorOnMainThread_withObject_waitUntilDone_(
                             objc.selector(self.sendClipboard_, signature=b"v@:@"),
                             None,
@@ -433,6 +615,9 @@ class KeyBridgeDelegate(NSObject):
                 pass
 
         try:
+            # Only needed when the Carbon hotkey fails; keep it off the launch path
+            from pynput import keyboard
+
             self.listener = keyboard.Listener(on_press=on_press, on_release=on_release)
             self.listener.start()
             print("[HOTKEY] Listener active: Press Ctrl+Cmd+V")
@@ -442,37 +627,27 @@ class KeyBridgeDelegate(NSObject):
 
     def statusItemClicked_(self, sender):
         """Handle click on status bar icon."""
-        current_time = time.time()
+        current_time = time.monotonic()  # Immune to wall-clock adjustments
         time_diff = current_time - self.last_click_time
 
         if time_diff < self.double_click_threshold:
-            # Double click detected
-            self.last_click_time = 0
-            if self.click_timer:
-                self.click_timer.invalidate()
-                self.click_timer = None
+            # Double click detected - disarm the pending menu timer
+            self.last_click_time = 0.0
+            self.click_timer.setFireDate_(NSDate.distantFuture())
             self.sendClipboard_(sender)
         else:
             # First click - wait to see if it's a double click
             self.last_click_time = current_time
 
-            # Cancel any existing timer
-            if self.click_timer:
-                self.click_timer.invalidate()
-
-            # Set timer to show menu after threshold
-            self.click_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-                self.double_click_threshold,
-                self,
-                objc.selector(self.showMenuAfterDelay_, signature=b"v@:@"),
-                None,
-                False,
+            # Re-arm the timer to show menu after threshold
+            self.click_timer.setFireDate_(
+                NSDate.dateWithTimeIntervalSinceNow_(self.double_click_threshold)
             )
 
     def showMenuAfterDelay_(self, timer):
         """Show menu after single-click delay."""
-        self.click_timer = None
-        self.last_click_time = 0
+        self.click_timer.setFireDate_(NSDate.distantFuture())
+        self.last_click_time = 0.0
         self.status_item.popUpStatusItemMenu_(self.menu)
 
     def showAbout_(self, sender):
@@ -484,10 +659,11 @@ class KeyBridgeDelegate(NSObject):
         alert.setInformativeText_(
             "📱 Send clipboard text via Bluetooth to KeyBridge dongle\n\n"
             "⌨️ Hotkey: Ctrl+Cmd+V\n\n"
-            "🔐 Required Permission:\n"
+            "The hotkey is registered with the system and needs no permission.\n\n"
+            "🔐 Only if the hotkey doesn't work:\n"
             "System Settings → Privacy & Security → Input Monitoring\n"
-            "  ✓ Add KeyBridge to the list\n\n"
-            "If the hotkey doesn't work, grant this permission and restart the app."
+            "  ✓ Add KeyBridge to the list, then restart the app\n"
+            "(used by the fallback keyboard listener)"
         )
         alert.addButtonWithTitle_("OK")
         alert.runModal()
@@ -497,8 +673,8 @@ class KeyBridgeDelegate(NSObject):
         if self.sending:
             return
 
-        clipboard = get_clipboard()
-        if not clipboard:
+        encoded = self._get_clipboard_bytes()
+        if not encoded:
             send_notification("KeyBridge", "Empty", "Clipboard is empty")
             return
 
@@ -516,191 +692,41 @@ class KeyBridgeDelegate(NSObject):
         self._send_timer.start()
 
         # Run async in BLE thread
-        if self.loop:
-            asyncio.run_coroutine_threadsafe(
-                self._send_clipboard_flow(clipboard), self.loop
-            )
-
-    async def _send_clipboard_flow(self, text):
-        """Complete flow: connect → send → wait for completion → disconnect."""
-        client = None
-        try:
-            # Find device (with retry in case dongle is mid-restart)
-            device = await BleakScanner.find_device_by_name(DEVICE_NAME, timeout=10.0)
-            if device is None:
-                await asyncio.sleep(2)
-                device = await BleakScanner.find_device_by_name(
-                    DEVICE_NAME, timeout=10.0
-                )
-            if device is None:
-                send_notification(
-                    "KeyBridge", "Not Found", f"Cannot find '{DEVICE_NAME}'"
-                )
-                return
-
-            # Connect with a fresh client each session (no stale state)
-            self._set_title("⌨️🔗")
-            client = BleakClient(device)
-            await asyncio.wait_for(client.connect(), timeout=10.0)
-
-            # Calculate chunk size
-            mtu = client.mtu_size
-            chunk_size = mtu - 3
-
-            # Send text
-            self._set_title("⌨️📤")
-            text = convert_to_ascii(text)
-            encoded = text.encode("utf-8")
-
-            # Flow control: track firmware buffer free space via notifications
-            FIRMWARE_BUFFER = 65535  # Exact usable buffer (64KB - 1 circular sentinel)
-            SEND_THRESHOLD = 4096  # Pause sending if fewer than 4KB free
-
-            buffer_event = asyncio.Event()
-            buffer_event.set()
-            current_free = [FIRMWARE_BUFFER]
-
-            # Read actual buffer status from firmware (set on connect)
-            try:
-                raw = await asyncio.wait_for(
-                    client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0
-                )
-                val = int.from_bytes(raw, "little")
-                if val > 0:
-                    current_free[0] = val
-            except Exception:
-                pass  # Fall back to FIRMWARE_BUFFER default
-
-            def status_callback(sender, data):
-                try:
-                    if data and len(data) >= 4:
-                        current_free[0] = int.from_bytes(data[:4], "little")
-                except Exception:
-                    pass
-                buffer_event.set()  # Always signal to prevent flow control hang
-
-            await client.start_notify(CHAR_STATUS_UUID, status_callback)
-            try:
-                for i in range(0, len(encoded), chunk_size):
-                    chunk = encoded[i : i + chunk_size]
-
-                    # Wait if not enough free space (with timeout to prevent infinite hangs)
-                    wait_start = time.monotonic()
-                    while current_free[0] < SEND_THRESHOLD:
-                        # Wait for buffer space notification with timeout
-                        buffer_event.clear()
-                        try:
-                            await asyncio.wait_for(buffer_event.wait(), timeout=5.0)
-                        except asyncio.TimeoutError:
-                            # Re-check buffer status on timeout
-                            try:
-                                raw = await asyncio.wait_for(
-                                    client.read_gatt_char(CHAR_STATUS_UUID), timeout=2.0
-                                )
-                                current_free[0] = int.from_bytes(raw, "little")
-                            except Exception:
-                                pass  # Keep current estimate and continue waiting
-
-                            # Check if we've waited too long (30 seconds max)
-                            if time.monotonic() - wait_start > 30:
-                                print(
-                                    f"[FLOW] Buffer wait timed out after 30s, forcing through"
-                                )
-                                break
-
-                    # Send with timeout — prevents infinite hang if firmware stops responding
-                    await asyncio.wait_for(
-                        client.write_gatt_char(CHAR_TEXT_UUID, chunk, response=True),
-                        timeout=10.0,
-                    )
-
-                    # Update buffer status after write
-                    try:
-                        raw = await asyncio.wait_for(
-                            client.read_gatt_char(CHAR_STATUS_UUID), timeout=2.0
-                        )
-                        current_free[0] = int.from_bytes(raw, "little")
-                    except Exception:
-                        pass  # Will be updated via notification or next read
-            finally:
-                try:
-                    await client.stop_notify(CHAR_STATUS_UUID)
-                except Exception:
-                    pass  # Swallow — outer finally handles disconnect
-
-            # Wait for firmware to finish typing (queue fully drained)
-            self._set_title("⌨️⏳")
-            await self._wait_for_completion(client)
-
-            send_notification("KeyBridge", "Sent", f"{len(text)} chars")
-
-        except Exception as e:
-            send_notification("KeyBridge", "Error", str(e)[:50])
-
-        finally:
-            if client and client.is_connected:
-                try:
-                    await client.disconnect()
-                except Exception:
-                    pass
+        if not self.ble.send_async(encoded):
+            send_notification("KeyBridge", "Not Ready", "Bluetooth is still starting, try again")
             self._reset_ui()
 
-    async def _wait_for_completion(self, client):
-        """Wait until firmware reports buffer is fully free (typing complete)."""
-        FIRMWARE_BUFFER_FULL = 65535
-        COMPLETION_TIMEOUT = 180  # 3 minutes max for very large pastes
-        POLL_INTERVAL = 1.0
+    def _get_clipboard_bytes(self):
+        """Return the clipboard as ASCII bytes, re-encoding only when it changed."""
+        change_count = self._pasteboard.changeCount()
+        if change_count != self._last_change_count:
+            text = get_clipboard(self._pasteboard)
+            self._cached_bytes = convert_to_ascii(text).encode("utf-8") if text else b""
+            self._last_change_count = change_count
+        return self._cached_bytes
 
-        start = time.monotonic()
-        last_free = 0
-        stall_count = 0
+    def _show_status(self, state):
+        """Reflect a BleSender state in the menu bar title."""
+        self._set_title(STATUS_TITLES[state])
 
-        while True:
-            elapsed = time.monotonic() - start
-            if elapsed >= COMPLETION_TIMEOUT:
-                print(
-                    f"[COMPLETE] Timed out after {elapsed:.1f}s — firmware may still be typing"
-                )
-                return
-
-            try:
-                raw = await asyncio.wait_for(
-                    client.read_gatt_char(CHAR_STATUS_UUID), timeout=3.0
-                )
-                current_free = int.from_bytes(raw, "little")
-            except Exception:
-                stall_count += 1
-                if stall_count >= 10:
-                    print(
-                        f"[COMPLETE] Stalled reading status for {stall_count} attempts"
-                    )
-                    return
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-
-            stall_count = 0  # Reset on successful read
-
-            if current_free >= FIRMWARE_BUFFER_FULL - 1:
-                print(f"[COMPLETE] Firmware queue drained after {elapsed:.1f}s")
-                return
-
-            # Detect stall (buffer not freeing for 30+ seconds)
-            if current_free == last_free:
-                stall_count += 1
-                if stall_count >= 30:
-                    print(f"[COMPLETE] Buffer stalled at {current_free} free for 30s")
-                    return
-            else:
-                stall_count = 0
+    def _set_title(self, title):
+        """Set status item title from any thread.
 
-            last_free = current_free
-            await asyncio.sleep(POLL_INTERVAL)
+        Changes made before the main thread gets to them are coalesced: at most
+        one block is queued, and it applies whichever title is latest.
+        """
+        if title == self._last_title:
+            return
+        self._last_title = title
+        if self._title_queued:
+            return
+        self._title_queued = True
+        NSOperationQueue.mainQueue().addOperationWithBlock_(self._apply_title)
 
-    def _set_title(self, title):
-        """Set status item title from any thread."""
-        self.status_item.performSelectorOnMainThread_withObject_waitUntilDone_(
-            objc.selector(self.status_item.setTitle_, signature=b"v@:@"), title, False
-        )
+    def _apply_title(self):
+        # Clear the flag before reading, so a title set meanwhile re-queues
+        self._title_queued = False
+        self.status_item.setTitle_(self._last_title)
 
     def _reset_ui(self):
         """Reset UI to idle state."""
@@ -710,20 +736,12 @@ class KeyBridgeDelegate(NSObject):
             self._send_timer.cancel()
             self._send_timer = None
 
-    def _start_ble_thread(self):
-        """Start the asyncio event loop in a background thread."""
-
-        def run_loop():
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_forever()
-
-        self.ble_thread = threading.Thread(target=run_loop, daemon=True)
-        self.ble_thread.start()
-
     def quitApp_(self, sender):
         """Quit the application."""
-        # Stop listener
+        # Stop hotkey / listener
+        if self.hotkey:
+            self.hotkey.unregister()
+            self.hotkey = None
         if self.listener:
             self.listener.stop()
 
@@ -732,9 +750,9 @@ class KeyBridgeDelegate(NSObject):
             self.click_timer.invalidate()
             self.click_timer = None
 
-        # Stop asyncio loop
-        if self.loop:
-            self.loop.call_soon_threadsafe(self.loop.stop)
+        # Close the warm BLE connection, then stop asyncio loop
+        if self.ble:
+            self.ble.stop()
 
         NSApplication.sharedApplication().terminate_(self)
 
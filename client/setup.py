@@ -11,6 +11,7 @@ INSTALL_REQUIRES = [
     'pyobjc-core>=10.0,<11.0',
     'pyobjc-framework-Cocoa>=10.0,<11.0',
     'pyobjc-framework-Quartz>=10.0,<11.0',
+    'pyobjc-framework-UserNotifications>=10.0,<11.0',
 ]
 
 APP = ['menubar_app.py']
@@ -30,22 +31,29 @@ OPTIONS = {
         'NSHighResolutionCapable': True,
         'LSMinimumSystemVersion': '10.15',
         'NSRequiresAquaSystemAppearance': False,
-        'NSAccessibilityUsageDescription': 'KeyBridge needs accessibility access to enable the Fn+Cmd+V global hotkey for sending clipboard content.',
-        'NSInputMonitoringUsageDescription': 'KeyBridge needs input monitoring access to detect the Fn+Cmd+V keyboard shortcut.',
+        'NSAccessibilityUsageDescription': 'KeyBridge needs accessibility access to enable the Ctrl+Cmd+V global hotkey for sending clipboard content.',
+        'NSInputMonitoringUsageDescription': 'KeyBridge needs input monitoring access to detect the Ctrl+Cmd+V keyboard shortcut.',
         'NSAppTransportSecurity': {
             'NSAllowsArbitraryLoads': True
         }
     },
     'iconfile': 'KeyBridge.icns',
+    # pynput loads its platform backend dynamically, so it must be listed;
+    # stdlib modules are found by py2app's import scan and need no entry
     'includes': PACKAGES + [
         'pynput', 'pynput.keyboard', 'pynput.keyboard._darwin',
         'pynput.mouse', 'pynput.mouse._darwin',
         'pynput._util', 'pynput._util.darwin',
     ],
-    'excludes': ['tkinter', 'test', 'unittest'],
+    # Stdlib and framework bindings the app never imports
+    'excludes': [
+        'tkinter', 'test', 'unittest', 'rumps',
+        'pydoc', 'pydoc_data', 'distutils', 'lib2to3',
+        'WebKit', 'CoreData',
+    ],
     'site_packages': True,
-    'strip': False,
-    'optimize': 0,
+    'strip': True,  # Strip debug symbols from bundled dylibs
+    'optimize': 2,  # Byte-compile with -OO (no docstrings/asserts)
 }
 
 setup(
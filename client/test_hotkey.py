@@ -10,12 +10,20 @@ from Quartz import (
     kCGSessionEventTap, kCGHeadInsertEventTap, kCGEventTapOptionListenOnly,
     kCGEventKeyDown, kCGKeyboardEventKeycode, kCFRunLoopCommonModes,
     kCGEventFlagMaskCommand, kCGEventFlagMaskControl, kCGEventFlagMaskShift,
+    kCGEventTapDisabledByTimeout, kCGEventTapDisabledByUserInput,
 )
 
 print("Testing CGEventTap... Press any key. Ctrl+C to quit.")
 print("Looking for Ctrl+Shift+V (keycode 9)")
 
+HOTKEY_MASK = kCGEventFlagMaskControl | kCGEventFlagMaskShift
+
 def callback(proxy, event_type, event, refcon):
+    # macOS switches the tap off if a callback is slow or on secure input; re-arm it
+    if event_type in (kCGEventTapDisabledByTimeout, kCGEventTapDisabledByUserInput):
+        print("  (tap was disabled by the system, re-enabling)")
+        CGEventTapEnable(tap, True)
+        return event
     if event_type != kCGEventKeyDown:
         return event
     keycode = CGEventGetIntegerValueField(event, kCGKeyboardEventKeycode)
@@ -29,7 +37,7 @@ def callback(proxy, event_type, event, refcon):
     if cmd: mods.append("Cmd")
     mod_str = "+".join(mods) if mods else "none"
     print(f"  KEY: keycode={keycode} modifiers={mod_str}")
-    if keycode == 9 and ctrl and shift:
+    if keycode == 9 and (flags & HOTKEY_MASK) == HOTKEY_MASK:
         print("  >>> CTRL+SHIFT+V DETECTED! <<<")
     return event
 
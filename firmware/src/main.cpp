@@ -115,6 +115,15 @@ unsigned long pausedTimeRemaining = 0; // Store remaining time when BLE connects
 #define CHAR_HID_UUID "beb5483e-36e1-4688-b7f5-ea07361b26a9"
 #define CHAR_STATUS_UUID "beb5483e-36e1-4688-b7f5-ea07361b26aa"
 
+// Requested ATT MTU: the BLE 5.0 maximum. Clients write MTU - 3 bytes per chunk,
+// so this is the only cap on chunk size
+#define BLE_MTU 517
+
+// Preferred connection parameters (interval in 1.25 ms units, timeout in 10 ms units)
+#define CONN_INTERVAL_MIN 0x0C        // 15 ms
+#define CONN_INTERVAL_MAX 0x18        // 30 ms
+#define CONN_SUPERVISION_TIMEOUT 400  // 4 s
+
 // SECURITY NOTE: This firmware intentionally provides no authentication or encryption.
 // BLE pairing is disabled to maximize ease of use. Anyone within Bluetooth range can
 // send keystrokes to this device. Use only in trusted environments. For secure
@@ -397,6 +406,18 @@ class ServerCallbacks : public BLEServerCallbacks
         }
     }
 
+    void onConnect(BLEServer *pServer, esp_ble_gatts_cb_param_t *param) override
+    {
+        // Connection interval bounds write latency. Ask for 15-30 ms (units of
+        // 1.25 ms, timeout in 10 ms) - the shortest range Apple hosts accept -
+        // unless the central already picked something faster (e.g. BlueZ at 7.5 ms)
+        if (param->connect.conn_params.interval > CONN_INTERVAL_MIN)
+        {
+            pServer->updateConnParams(param->connect.remote_bda,
+                                      CONN_INTERVAL_MIN, CONN_INTERVAL_MAX, 0, CONN_SUPERVISION_TIMEOUT);
+        }
+    }
+
     void onDisconnect(BLEServer *pServer) override
     {
         deviceConnected = false;
@@ -517,9 +538,13 @@ class HidCharCallbacks : public BLECharacteristicCallbacks
             Serial.printf("Error: HID write too short (%d bytes)\n", value.length());
             return;
         }
-        uint8_t modifiers = (uint8_t)value[0];
-        uint8_t keycode = (uint8_t)value[1];
-        sendHidKey(modifiers, keycode);
+
+        // Payload is one or more (modifiers, keycode) pairs - clients batch
+        // queued key events into a single write
+        for (size_t i = 0; i + 1 < value.length(); i += 2)
+        {
+            sendHidKey((uint8_t)value[i], (uint8_t)value[i + 1]);
+        }
     }
 };
 
@@ -1084,7 +1109,7 @@ void setup()
 
     // Initialize BLE with large MTU for fast transfers
     BLEDevice::init("KeyBridge");
-    BLEDevice::setMTU(517); // Max BLE 5.0 MTU
+    BLEDevice::setMTU(BLE_MTU);
     pServer = BLEDevice::createServer();
 
     // Use static instances to avoid memory leaks